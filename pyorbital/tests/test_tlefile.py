@@ -24,7 +24,7 @@
 """Test TLE file reading, TLE downloading and stroging TLEs to database."""
 
 
-from pyorbital.tlefile import Tle
+from pyorbital.tlefile import Tle, Downloader
 from pyorbital.tlefile import (_get_config_path,
                                read_platform_numbers,
                                _get_local_tle_path_from_env,
@@ -32,19 +32,19 @@ from pyorbital.tlefile import (_get_config_path,
                                check_is_platform_supported,
                                PKG_CONFIG_DIR)
 
+import io
 import logging
 import datetime
-import unittest
 from unittest.mock import patch
 from unittest import mock
 import pytest
 import os
-from contextlib import suppress
-import time
 
 line0 = "ISS (ZARYA)"
 line1 = "1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927"
 line2 = "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537"
+ISS_3LINES = "\n".join((line0, line1, line2))
+ISS_3LINES_BYTES = ISS_3LINES.encode('utf-8')
 
 line1_2 = "1 38771U 12049A   21137.30264622  .00000000  00000+0 -49996-5 0 00017"
 line2_2 = "2 38771  98.7162 197.7716 0002383 106.1049 122.6344 14.21477797449453"
@@ -54,6 +54,8 @@ NOAA19_2LINES = """1 33591U 09005A   21355.91138073  .00000074  00000+0  65091-4
 2 33591  99.1688  21.1338 0013414 329.8936  30.1462 14.12516400663123
 """
 NOAA19_3LINES = "NOAA 19\n" + NOAA19_2LINES
+NOAA19_2LINES_BYTES = NOAA19_2LINES.encode('utf-8')
+NOAA19_3LINES_BYTES = NOAA19_3LINES.encode('utf-8')
 
 
 tle_xml = '\n'.join(
@@ -78,6 +80,14 @@ tle_xml = '\n'.join(
         '</multi-mission-administrative-message>'))
 
 
+@pytest.fixture(scope="session")
+def mmam_xml_path(tmp_path_factory):
+    """Return file path to a MMAM XML file written once for the test session."""
+    file_path = tmp_path_factory.mktemp("mmam") / '20210420_Metop-B_ADMIN_MESSAGE_NO_127.xml'
+    file_path.write_text(tle_xml)
+    return str(file_path)
+
+
 @pytest.fixture
 def fake_platforms_file(tmp_path):
     """Return file path to a fake platforms.txt file."""
@@ -97,18 +107,15 @@ def fake_platforms_file(tmp_path):
 @pytest.fixture
 def fake_local_tles_dir(tmp_path, monkeypatch):
     """Make a list of fake tle files in a directory."""
-    file_path = tmp_path / 'tle-202211180230.txt'
-    file_path.touch()
-    file_path = tmp_path / 'tle-202211180430.txt'
-    file_path.touch()
-    file_path = tmp_path / 'tle-202211180630.txt'
-    file_path.touch()
-    file_path = tmp_path / 'tle-202211180830.txt'
-    file_path.touch()
+    for name in ('tle-202211180230.txt', 'tle-202211180430.txt',
+                 'tle-202211180630.txt', 'tle-202211180830.txt'):
+        # Create empty files without the extra utime call of Path.touch()
+        fd = os.open(str(tmp_path / name), os.O_CREAT | os.O_WRONLY, 0o644)
+        os.close(fd)
 
-    monkeypatch.setenv('TLES', str(file_path.parent))
+    monkeypatch.setenv('TLES', str(tmp_path))
 
-    yield file_path.parent
+    yield tmp_path
 
 
 @pytest.fixture
@@ -281,8 +288,8 @@ def test_get_uris_and_open_func_using_tles_env(caplog, fake_local_tles_dir):
     assert log_message in caplog.text
 
 
-class TLETest(unittest.TestCase):
-    """Test TLE reading.
+def _check_iss_example(tle):
+    """Check the *tle* instance against predetermined values.
 
     We're using the wikipedia example::
 
@@ -291,90 +298,69 @@ class TLETest(unittest.TestCase):
      2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537
 
     """
-
-    def check_example(self, tle):
-        """Check the *tle* instance against predetermined values."""
-        # line 1
-        self.assertEqual(tle.satnumber, "25544")
-        self.assertEqual(tle.classification, "U")
-        self.assertEqual(tle.id_launch_year, "98")
-        self.assertEqual(tle.id_launch_number, "067")
-        self.assertEqual(tle.id_launch_piece.strip(), "A")
-        self.assertEqual(tle.epoch_year, "08")
-        self.assertEqual(tle.epoch_day, 264.51782528)
-        epoch = (datetime.datetime(2008, 1, 1)
-                 + datetime.timedelta(days=264.51782528 - 1))
-        self.assertEqual(tle.epoch, epoch)
-        self.assertEqual(tle.mean_motion_derivative, -.00002182)
-        self.assertEqual(tle.mean_motion_sec_derivative, 0.0)
-        self.assertEqual(tle.bstar, -.11606e-4)
-        self.assertEqual(tle.ephemeris_type, 0)
-        self.assertEqual(tle.element_number, 292)
-
-        # line 2
-        self.assertEqual(tle.inclination, 51.6416)
-        self.assertEqual(tle.right_ascension, 247.4627)
-        self.assertEqual(tle.excentricity, .0006703)
-        self.assertEqual(tle.arg_perigee, 130.5360)
-        self.assertEqual(tle.mean_anomaly, 325.0288)
-        self.assertEqual(tle.mean_motion, 15.72125391)
-        self.assertEqual(tle.orbit, 56353)
-
-    def test_from_line(self):
-        """Test parsing from line elements."""
-        tle = Tle("ISS (ZARYA)", line1=line1, line2=line2)
-        self.check_example(tle)
-
-    def test_from_file(self):
-        """Test reading and parsing from a file."""
-        from tempfile import mkstemp
-        from os import write, close, remove
-        filehandle, filename = mkstemp()
-        try:
-            write(filehandle, "\n".join([line0, line1, line2]).encode('utf-8'))
-            close(filehandle)
-            tle = Tle("ISS (ZARYA)", filename)
-            self.check_example(tle)
-        finally:
-            remove(filename)
-
-    def test_from_file_with_hyphenated_platform_name(self):
-        """Test reading and parsing from a file with a slightly different name."""
-        from tempfile import mkstemp
-        from os import write, close, remove
-        filehandle, filename = mkstemp()
-        try:
-            write(filehandle, NOAA19_3LINES.encode('utf-8'))
-            close(filehandle)
-            tle = Tle("NOAA-19", filename)
-            assert tle.satnumber == "33591"
-        finally:
-            remove(filename)
-
-    def test_from_file_with_no_platform_name(self):
-        """Test reading and parsing from a file with a slightly different name."""
-        from tempfile import mkstemp
-        from os import write, close, remove
-        filehandle, filename = mkstemp()
-        try:
-            write(filehandle, NOAA19_2LINES.encode('utf-8'))
-            close(filehandle)
-            tle = Tle("NOAA-19", filename)
-            assert tle.satnumber == "33591"
-        finally:
-            remove(filename)
-
-    def test_from_mmam_xml(self):
-        """Test reading from an MMAM XML file."""
-        from tempfile import TemporaryDirectory
-
-        save_dir = TemporaryDirectory()
-        with save_dir:
-            fname = os.path.join(save_dir.name, '20210420_Metop-B_ADMIN_MESSAGE_NO_127.xml')
-            with open(fname, 'w') as fid:
-                fid.write(tle_xml)
-            tle = Tle("", tle_file=fname)
-        self.check_example(tle)
+    # line 1
+    assert tle.satnumber == "25544"
+    assert tle.classification == "U"
+    assert tle.id_launch_year == "98"
+    assert tle.id_launch_number == "067"
+    assert tle.id_launch_piece.strip() == "A"
+    assert tle.epoch_year == "08"
+    assert tle.epoch_day == 264.51782528
+    epoch = (datetime.datetime(2008, 1, 1)
+             + datetime.timedelta(days=264.51782528 - 1))
+    assert tle.epoch == epoch
+    assert tle.mean_motion_derivative == -.00002182
+    assert tle.mean_motion_sec_derivative == 0.0
+    assert tle.bstar == -.11606e-4
+    assert tle.ephemeris_type == 0
+    assert tle.element_number == 292
+
+    # line 2
+    assert tle.inclination == 51.6416
+    assert tle.right_ascension == 247.4627
+    assert tle.excentricity == .0006703
+    assert tle.arg_perigee == 130.5360
+    assert tle.mean_anomaly == 325.0288
+    assert tle.mean_motion == 15.72125391
+    assert tle.orbit == 56353
+
+
+def test_tle_from_line():
+    """Test parsing from line elements."""
+    tle = Tle("ISS (ZARYA)", line1=line1, line2=line2)
+    _check_iss_example(tle)
+
+
+def test_tle_from_file(tmp_path):
+    """Test reading and parsing from a file."""
+    filename = tmp_path / "tle.txt"
+    filename.write_bytes(ISS_3LINES_BYTES)
+    tle = Tle("ISS (ZARYA)", str(filename))
+    _check_iss_example(tle)
+
+
+def test_tle_from_stream():
+    """Test reading and parsing from a file-like object."""
+    tle = Tle("ISS (ZARYA)", tle_file=io.BytesIO(ISS_3LINES_BYTES))
+    _check_iss_example(tle)
+
+
+def test_tle_from_file_with_hyphenated_platform_name():
+    """Test reading and parsing from a file with a slightly different name."""
+    tle = Tle("NOAA-19", tle_file=io.BytesIO(NOAA19_3LINES_BYTES))
+    assert tle.satnumber == "33591"
+
+
+def test_tle_from_file_with_no_platform_name():
+    """Test reading and parsing from a file with a slightly different name."""
+    tle = Tle("NOAA-19", tle_file=io.BytesIO(NOAA19_2LINES_BYTES))
+    assert tle.satnumber == "33591"
+
+
+def test_tle_from_mmam_xml(mmam_xml_path):
+    """Test reading from an MMAM XML file."""
+    tle = Tle("", tle_file=mmam_xml_path)
+    _check_iss_example(tle)
 
 
 FETCH_PLAIN_TLE_CONFIG = {
@@ -391,353 +377,333 @@ FETCH_SPACETRACK_CONFIG = {
 }
 
 
-class TestDownloader(unittest.TestCase):
-    """Test TLE downloader."""
-
-    def setUp(self):
-        """Create a downloader instance."""
-        from pyorbital.tlefile import Downloader
-        self.config = {}
-        self.dl = Downloader(self.config)
-
-    def test_init(self):
-        """Test the initialization."""
-        assert self.dl.config is self.config
-
-    @mock.patch('pyorbital.tlefile.requests')
-    def test_fetch_plain_tle_not_configured(self, requests):
-        """Test downloading and a TLE file from internet."""
-        requests.get = mock.MagicMock()
-        requests.get.return_value = _get_req_response(200)
-
-        # Not configured
-        self.dl.config["downloaders"] = {}
-        res = self.dl.fetch_plain_tle()
-        self.assertTrue(res == {})
-        requests.get.assert_not_called()
-
-    @mock.patch('pyorbital.tlefile.requests')
-    def test_fetch_plain_tle_two_sources(self, requests):
-        """Test downloading and a TLE file from internet."""
-        requests.get = mock.MagicMock()
-        requests.get.return_value = _get_req_response(200)
-
-        # Two sources, one with multiple locations
-        self.dl.config["downloaders"] = FETCH_PLAIN_TLE_CONFIG
-
-        res = self.dl.fetch_plain_tle()
-        self.assertTrue("source_1" in res)
-        self.assertEqual(len(res["source_1"]), 3)
-        self.assertEqual(res["source_1"][0].line1, line1)
-        self.assertEqual(res["source_1"][0].line2, line2)
-        self.assertTrue("source_2" in res)
-        self.assertEqual(len(res["source_2"]), 1)
-        self.assertTrue(mock.call("mocked_url_1") in requests.get.mock_calls)
-        self.assertEqual(len(requests.get.mock_calls), 4)
-
-    @mock.patch('pyorbital.tlefile.requests')
-    def test_fetch_plain_tle_server_is_a_teapot(self, requests):
-        """Test downloading a TLE file from internet."""
-        requests.get = mock.MagicMock()
-        # No data returned because the server is a teapot
-        requests.get.return_value = _get_req_response(418)
-
-        # Two sources, one with multiple locations
-        self.dl.config["downloaders"] = FETCH_PLAIN_TLE_CONFIG
-
-        res = self.dl.fetch_plain_tle()
-        # The sources are in the dict ...
-        self.assertEqual(len(res), 2)
-        # ... but there are no TLEs
-        self.assertEqual(len(res["source_1"]), 0)
-        self.assertEqual(len(res["source_2"]), 0)
-        self.assertTrue(mock.call("mocked_url_1") in requests.get.mock_calls)
-        self.assertEqual(len(requests.get.mock_calls), 4)
-
-    @mock.patch('pyorbital.tlefile.requests')
-    def test_fetch_spacetrack_login_fails(self, requests):
-        """Test downloading TLEs from space-track.org."""
-        mock_post = mock.MagicMock()
-        mock_session = mock.MagicMock()
-        mock_session.post = mock_post
-        requests.Session.return_value.__enter__.return_value = mock_session
-
-        self.dl.config["platforms"] = {
-            25544: 'ISS'
-        }
-        self.dl.config["downloaders"] = FETCH_SPACETRACK_CONFIG
-
-        # Login fails, because the server is a teapot
-        mock_post.return_value.status_code = 418
-        res = self.dl.fetch_spacetrack()
-        # Empty list of TLEs is returned
-        self.assertTrue(res == [])
-        # The login was anyway attempted
-        mock_post.assert_called_with(
-            'https://www.space-track.org/ajaxauth/login',
-            data={'identity': 'username', 'password': 'passw0rd'})
-
-    @mock.patch('pyorbital.tlefile.requests')
-    def test_fetch_spacetrack_get_fails(self, requests):
-        """Test downloading TLEs from space-track.org."""
-        mock_post = mock.MagicMock()
-        mock_get = mock.MagicMock()
-        mock_session = mock.MagicMock()
-        mock_session.post = mock_post
-        mock_session.get = mock_get
-        requests.Session.return_value.__enter__.return_value = mock_session
-
-        self.dl.config["platforms"] = {
-            25544: 'ISS'
+@pytest.fixture
+def downloader():
+    """Create a downloader instance."""
+    return Downloader({})
+
+
+def test_downloader_init():
+    """Test the initialization."""
+    config = {}
+    dl = Downloader(config)
+    assert dl.config is config
+
+
+@mock.patch('pyorbital.tlefile.requests')
+def test_fetch_plain_tle_not_configured(requests, downloader):
+    """Test downloading and a TLE file from internet."""
+    requests.get = mock.MagicMock()
+    requests.get.return_value = _get_req_response(200)
+
+    # Not configured
+    downloader.config["downloaders"] = {}
+    res = downloader.fetch_plain_tle()
+    assert res == {}
+    requests.get.assert_not_called()
+
+
+@mock.patch('pyorbital.tlefile.requests')
+def test_fetch_plain_tle_two_sources(requests, downloader):
+    """Test downloading and a TLE file from internet."""
+    requests.get = mock.MagicMock()
+    requests.get.return_value = _get_req_response(200)
+
+    # Two sources, one with multiple locations
+    downloader.config["downloaders"] = FETCH_PLAIN_TLE_CONFIG
+
+    res = downloader.fetch_plain_tle()
+    assert "source_1" in res
+    assert len(res["source_1"]) == 3
+    assert res["source_1"][0].line1 == line1
+    assert res["source_1"][0].line2 == line2
+    assert "source_2" in res
+    assert len(res["source_2"]) == 1
+    assert mock.call("mocked_url_1") in requests.get.mock_calls
+    assert len(requests.get.mock_calls) == 4
+
+
+@mock.patch('pyorbital.tlefile.requests')
+def test_fetch_plain_tle_server_is_a_teapot(requests, downloader):
+    """Test downloading a TLE file from internet."""
+    requests.get = mock.MagicMock()
+    # No data returned because the server is a teapot
+    requests.get.return_value = _get_req_response(418)
+
+    # Two sources, one with multiple locations
+    downloader.config["downloaders"] = FETCH_PLAIN_TLE_CONFIG
+
+    res = downloader.fetch_plain_tle()
+    # The sources are in the dict ...
+    assert len(res) == 2
+    # ... but there are no TLEs
+    assert len(res["source_1"]) == 0
+    assert len(res["source_2"]) == 0
+    assert mock.call("mocked_url_1") in requests.get.mock_calls
+    assert len(requests.get.mock_calls) == 4
+
+
+def test_read_tle_files(downloader, tmp_path):
+    """Test reading TLE files from a file system."""
+    fname = os.path.join(tmp_path, 'tle_20200129_1600.txt')
+    with open(fname, 'w') as fid:
+        fid.write(ISS_3LINES)
+    # Add a non-existent file, it shouldn't cause a crash
+    nonexistent = os.path.join(tmp_path, 'not_here.txt')
+    # Use a wildcard to collect files (passed to glob)
+    starred_fname = os.path.join(tmp_path, 'tle*txt')
+    downloader.config["downloaders"] = {
+        "read_tle_files": {
+            "paths": [fname, nonexistent, starred_fname]
         }
-        self.dl.config["downloaders"] = FETCH_SPACETRACK_CONFIG
-
-        # Login works, but something is wrong (teapot) when asking for data
-        mock_post.return_value.status_code = 200
-        mock_get.return_value.status_code = 418
-        res = self.dl.fetch_spacetrack()
-        self.assertTrue(res == [])
-        mock_get.assert_called_with("https://www.space-track.org/"
-                                    "basicspacedata/query/class/tle_latest/"
-                                    "ORDINAL/1/NORAD_CAT_ID/25544/format/tle")
-
-    @mock.patch('pyorbital.tlefile.requests')
-    def test_fetch_spacetrack_success(self, requests):
-        """Test downloading TLEs from space-track.org."""
-        mock_post = mock.MagicMock()
-        mock_get = mock.MagicMock()
-        mock_session = mock.MagicMock()
-        mock_session.post = mock_post
-        mock_session.get = mock_get
-        requests.Session.return_value.__enter__.return_value = mock_session
-
-        tle_text = '\n'.join((line0, line1, line2))
-        self.dl.config["platforms"] = {
-            25544: 'ISS'
+    }
+    res = downloader.read_tle_files()
+    assert len(res) == 2
+    assert res[0].line1 == line1
+    assert res[0].line2 == line2
+
+
+def test_read_xml_admin_messages(downloader, mmam_xml_path):
+    """Test reading TLE files from a file system."""
+    save_dir = os.path.dirname(mmam_xml_path)
+    # Add a non-existent file, it shouldn't cause a crash
+    nonexistent = os.path.join(save_dir, 'not_here.txt')
+    # Use a wildcard to collect files (passed to glob)
+    starred_fname = os.path.join(save_dir, '*.xml')
+    downloader.config["downloaders"] = {
+        "read_xml_admin_messages": {
+            "paths": [mmam_xml_path, nonexistent, starred_fname]
         }
-        self.dl.config["downloaders"] = FETCH_SPACETRACK_CONFIG
-
-        # Login works and data is received
-        mock_post.return_value.status_code = 200
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.text = tle_text
-        res = self.dl.fetch_spacetrack()
-        self.assertEqual(len(res), 1)
-        self.assertEqual(res[0].line1, line1)
-        self.assertEqual(res[0].line2, line2)
-
-    def test_read_tle_files(self):
-        """Test reading TLE files from a file system."""
-        from tempfile import TemporaryDirectory
-
-        tle_text = '\n'.join((line0, line1, line2))
-
-        save_dir = TemporaryDirectory()
-        with save_dir:
-            fname = os.path.join(save_dir.name, 'tle_20200129_1600.txt')
-            with open(fname, 'w') as fid:
-                fid.write(tle_text)
-            # Add a non-existent file, it shouldn't cause a crash
-            nonexistent = os.path.join(save_dir.name, 'not_here.txt')
-            # Use a wildcard to collect files (passed to glob)
-            starred_fname = os.path.join(save_dir.name, 'tle*txt')
-            self.dl.config["downloaders"] = {
-                "read_tle_files": {
-                    "paths": [fname, nonexistent, starred_fname]
-                }
-            }
-            res = self.dl.read_tle_files()
-        self.assertEqual(len(res), 2)
-        self.assertEqual(res[0].line1, line1)
-        self.assertEqual(res[0].line2, line2)
-
-    def test_read_xml_admin_messages(self):
-        """Test reading TLE files from a file system."""
-        from tempfile import TemporaryDirectory
-
-        save_dir = TemporaryDirectory()
-        with save_dir:
-            fname = os.path.join(save_dir.name, '20210420_Metop-B_ADMIN_MESSAGE_NO_127.xml')
-            with open(fname, 'w') as fid:
-                fid.write(tle_xml)
-            # Add a non-existent file, it shouldn't cause a crash
-            nonexistent = os.path.join(save_dir.name, 'not_here.txt')
-            # Use a wildcard to collect files (passed to glob)
-            starred_fname = os.path.join(save_dir.name, '*.xml')
-            self.dl.config["downloaders"] = {
-                "read_xml_admin_messages": {
-                    "paths": [fname, nonexistent, starred_fname]
-                }
-            }
-            res = self.dl.read_xml_admin_messages()
-
-        # There are two sets of TLEs in the file.  And as the same file is
-        # parsed twice, 4 TLE objects are returned
-        self.assertEqual(len(res), 4)
-        self.assertEqual(res[0].line1, line1)
-        self.assertEqual(res[0].line2, line2)
-        self.assertEqual(res[1].line1, line1_2)
-        self.assertEqual(res[1].line2, line2_2)
+    }
+    res = downloader.read_xml_admin_messages()
+
+    # There are two sets of TLEs in the file.  And as the same file is
+    # parsed twice, 4 TLE objects are returned
+    assert len(res) == 4
+    assert res[0].line1 == line1
+    assert res[0].line2 == line2
+    assert res[1].line1 == line1_2
+    assert res[1].line2 == line2_2
+
+
+@pytest.fixture
+def mocked_session():
+    """Mock the requests session used for downloading from Space-Track."""
+    with mock.patch('pyorbital.tlefile.requests') as requests:
+        yield requests.Session.return_value.__enter__.return_value
+
+
+@pytest.fixture
+def spacetrack_downloader(downloader):
+    """Configure the downloader instance for Space-Track."""
+    downloader.config["platforms"] = {25544: 'ISS'}
+    downloader.config["downloaders"] = FETCH_SPACETRACK_CONFIG
+    return downloader
+
+
+def test_fetch_spacetrack_login_fails(mocked_session, spacetrack_downloader):
+    """Test downloading TLEs from space-track.org."""
+    # Login fails, because the server is a teapot
+    mocked_session.post.return_value.status_code = 418
+    res = spacetrack_downloader.fetch_spacetrack()
+    # Empty list of TLEs is returned
+    assert res == []
+    # The login was anyway attempted
+    mocked_session.post.assert_called_with(
+        'https://www.space-track.org/ajaxauth/login',
+        data={'identity': 'username', 'password': 'passw0rd'})
+
+
+def test_fetch_spacetrack_get_fails(mocked_session, spacetrack_downloader):
+    """Test downloading TLEs from space-track.org."""
+    # Login works, but something is wrong (teapot) when asking for data
+    mocked_session.post.return_value.status_code = 200
+    mocked_session.get.return_value.status_code = 418
+    res = spacetrack_downloader.fetch_spacetrack()
+    assert res == []
+    mocked_session.get.assert_called_with("https://www.space-track.org/"
+                                          "basicspacedata/query/class/tle_latest/"
+                                          "ORDINAL/1/NORAD_CAT_ID/25544/format/tle")
+
+
+def test_fetch_spacetrack_success(mocked_session, spacetrack_downloader):
+    """Test downloading TLEs from space-track.org."""
+    # Login works and data is received
+    mocked_session.post.return_value.status_code = 200
+    mocked_session.get.return_value.status_code = 200
+    mocked_session.get.return_value.text = ISS_3LINES
+    res = spacetrack_downloader.fetch_spacetrack()
+    assert len(res) == 1
+    assert res[0].line1 == line1
+    assert res[0].line2 == line2
 
 
 def _get_req_response(code):
     req = mock.MagicMock()
     req.status_code = code
-    req.text = '\n'.join((line0, line1, line2))
+    req.text = ISS_3LINES
     return req
 
 
-class TestSQLiteTLE(unittest.TestCase):
-    """Test saving TLE data to a SQLite database."""
+SQLITE_PLATFORMS = {25544: "ISS"}
 
-    def setUp(self):
-        """Create a database instance."""
-        from pyorbital.tlefile import SQLiteTLE
-        from pyorbital.tlefile import Tle
-        from tempfile import TemporaryDirectory
 
-        self.temp_dir = TemporaryDirectory()
-        self.db_fname = os.path.join(self.temp_dir.name, 'tle.db')
-        self.platforms = {25544: "ISS"}
-        self.writer_config = {
-            "output_dir": os.path.join(self.temp_dir.name, 'tle_dir'),
-            "filename_pattern": "tle_%Y%m%d_%H%M%S.%f.txt",
-            "write_name": True,
-            "write_always": False
-        }
-        self.db = SQLiteTLE(self.db_fname, self.platforms, self.writer_config)
-        self.tle = Tle('ISS', line1=line1, line2=line2)
+@pytest.fixture
+def sqlite_db():
+    """Create an in-memory database instance."""
+    from pyorbital.tlefile import SQLiteTLE
+
+    writer_config = {
+        "output_dir": "tle_dir",
+        "filename_pattern": "tle_%Y%m%d_%H%M%S.%f.txt",
+        "write_name": True,
+        "write_always": False
+    }
+    db = SQLiteTLE(":memory:", SQLITE_PLATFORMS, writer_config)
+    yield db
+    db.close()
 
-    def tearDown(self):
-        """Clean temporary files."""
-        with suppress(PermissionError, NotADirectoryError):
-            self.temp_dir.cleanup()
 
-    def test_init(self):
-        """Test that the init did what it should have."""
-        from pyorbital.tlefile import table_exists, PLATFORM_NAMES_TABLE
+@pytest.fixture
+def iss_tle():
+    """Create a TLE instance of the ISS example."""
+    return Tle('ISS', line1=line1, line2=line2)
 
-        columns = [col.strip() for col in
-                   PLATFORM_NAMES_TABLE.strip('()').split(',')]
-        num_columns = len(columns)
 
-        self.assertTrue(os.path.exists(self.db_fname))
-        self.assertTrue(table_exists(self.db.db, "platform_names"))
-        res = self.db.db.execute('select * from platform_names')
-        names = [description[0] for description in res.description]
-        self.assertEqual(len(names), num_columns)
-        for col in columns:
-            self.assertTrue(col.split(' ')[0] in names)
-
-    def test_update_db(self):
-        """Test updating database with new data."""
-        from pyorbital.tlefile import (table_exists, SATID_TABLE,
-                                       ISO_TIME_FORMAT)
-
-        # Get the column names
-        columns = [col.strip() for col in
-                   SATID_TABLE.replace("'{}' (", "").strip(')').split(',')]
-        # Platform number
-        satid = str(list(self.platforms.keys())[0])
-
-        # Data from a platform that isn't configured
-        self.db.platforms = {}
-        self.db.update_db(self.tle, 'foo')
-        self.assertFalse(table_exists(self.db.db, satid))
-        self.assertFalse(self.db.updated)
-
-        # Configured platform
-        self.db.platforms = self.platforms
-        self.db.update_db(self.tle, 'foo')
-        self.assertTrue(table_exists(self.db.db, satid))
-        self.assertTrue(self.db.updated)
-
-        # Check that all the columns were added
-        res = self.db.db.execute("select * from '%s'" % satid)
+def test_sqlite_init(tmp_path):
+    """Test that the init did what it should have."""
+    from pyorbital.tlefile import SQLiteTLE, table_exists, PLATFORM_NAMES_TABLE
+
+    columns = [col.strip() for col in
+               PLATFORM_NAMES_TABLE.strip('()').split(',')]
+    num_columns = len(columns)
+
+    db_fname = tmp_path / 'tle.db'
+    db = SQLiteTLE(str(db_fname), SQLITE_PLATFORMS, {})
+    try:
+        assert db_fname.exists()
+        assert table_exists(db.db, "platform_names")
+        res = db.db.execute('select * from platform_names')
         names = [description[0] for description in res.description]
+        assert len(names) == num_columns
         for col in columns:
-            self.assertTrue(col.split(' ')[0] in names)
-
-        # Check the data
-        data = res.fetchall()
-        self.assertEqual(len(data), 1)
-        # epoch
-        self.assertEqual(data[0][0], '2008-09-20T12:25:40.104192')
-        # TLE
-        self.assertEqual(data[0][1], '\n'.join((line1, line2)))
-        # Date when the data were added should be close to current time
-        date_added = datetime.datetime.strptime(data[0][2], ISO_TIME_FORMAT)
-        now = datetime.datetime.utcnow()
-        self.assertTrue((now - date_added).total_seconds() < 1.0)
-        # Source of the data
-        self.assertTrue(data[0][3] == 'foo')
-
-        # Try to add the same data again. Nothing should change even
-        # if the source is different if the epoch is the same
-        self.db.update_db(self.tle, 'bar')
-        res = self.db.db.execute("select * from '%s'" % satid)
-        data = res.fetchall()
-        self.assertEqual(len(data), 1)
-        date_added2 = datetime.datetime.strptime(data[0][2], ISO_TIME_FORMAT)
-        self.assertEqual(date_added, date_added2)
-        # Source of the data
-        self.assertTrue(data[0][3] == 'foo')
-
-    def test_write_tle_txt(self):
-        """Test reading data from the database and writing it to a file."""
-        import glob
-        tle_dir = self.writer_config["output_dir"]
-
-        # Put some data in the database
-        self.db.update_db(self.tle, 'foo')
-
-        # Fake that the database hasn't been updated
-        self.db.updated = False
-
-        # Try to dump the data to disk
-        self.db.write_tle_txt()
-
-        # The output dir hasn't been created
-        self.assertFalse(os.path.exists(tle_dir))
-
-        self.db.updated = True
-        self.db.write_tle_txt()
-
-        # The dir should be there
-        self.assertTrue(os.path.exists(tle_dir))
-        # There should be one file in the directory
-        files = glob.glob(os.path.join(tle_dir, 'tle_*txt'))
-        self.assertEqual(len(files), 1)
-        # The file should have been named with the date ('%' characters
-        # not there anymore)
-        self.assertTrue('%' not in files[0])
-        # The satellite name should be in the file
-        with open(files[0], 'r') as fid:
-            data = fid.read().split('\n')
-        self.assertEqual(len(data), 3)
-        self.assertTrue('ISS' in data[0])
-        self.assertEqual(data[1], line1)
-        self.assertEqual(data[2], line2)
-
-        # Call the writing again, nothing should be written. In
-        # real-life this assumes a re-run has been done without new
-        # TLE data
-        self.db.updated = False
-        self.db.write_tle_txt()
-        files = glob.glob(os.path.join(tle_dir, 'tle_*txt'))
-        self.assertEqual(len(files), 1)
-
-        # Force writing with every call
-        # Do not write the satellite name
-        self.db.writer_config["write_always"] = True
-        self.db.writer_config["write_name"] = False
-        # Wait a bit to ensure different filename
-        time.sleep(2)
-        self.db.write_tle_txt()
-        files = sorted(glob.glob(os.path.join(tle_dir, 'tle_*txt')))
-        self.assertEqual(len(files), 2)
-        with open(files[1], 'r') as fid:
-            data = fid.read().split('\n')
-        self.assertEqual(len(data), 2)
-        self.assertEqual(data[0], line1)
-        self.assertEqual(data[1], line2)
+            assert col.split(' ')[0] in names
+    finally:
+        db.close()
+
+
+def test_sqlite_update_db(sqlite_db, iss_tle):
+    """Test updating database with new data."""
+    from pyorbital.tlefile import (table_exists, SATID_TABLE,
+                                   ISO_TIME_FORMAT)
+
+    # Get the column names
+    columns = [col.strip() for col in
+               SATID_TABLE.replace("'{}' (", "").strip(')').split(',')]
+    # Platform number
+    satid = str(list(SQLITE_PLATFORMS.keys())[0])
+
+    # Data from a platform that isn't configured
+    sqlite_db.platforms = {}
+    sqlite_db.update_db(iss_tle, 'foo')
+    assert not table_exists(sqlite_db.db, satid)
+    assert not sqlite_db.updated
+
+    # Configured platform
+    sqlite_db.platforms = SQLITE_PLATFORMS
+    sqlite_db.update_db(iss_tle, 'foo')
+    assert table_exists(sqlite_db.db, satid)
+    assert sqlite_db.updated
+
+    # Check that all the columns were added
+    res = sqlite_db.db.execute("select * from '%s'" % satid)
+    names = [description[0] for description in res.description]
+    for col in columns:
+        assert col.split(' ')[0] in names
+
+    # Check the data
+    data = res.fetchall()
+    assert len(data) == 1
+    # epoch
+    assert data[0][0] == '2008-09-20T12:25:40.104192'
+    # TLE
+    assert data[0][1] == '\n'.join((line1, line2))
+    # Date when the data were added should be close to current time
+    date_added = datetime.datetime.strptime(data[0][2], ISO_TIME_FORMAT)
+    now = datetime.datetime.utcnow()
+    assert (now - date_added).total_seconds() < 1.0
+    # Source of the data
+    assert data[0][3] == 'foo'
+
+    # Try to add the same data again. Nothing should change even
+    # if the source is different if the epoch is the same
+    sqlite_db.update_db(iss_tle, 'bar')
+    res = sqlite_db.db.execute("select * from '%s'" % satid)
+    data = res.fetchall()
+    assert len(data) == 1
+    date_added2 = datetime.datetime.strptime(data[0][2], ISO_TIME_FORMAT)
+    assert date_added == date_added2
+    # Source of the data
+    assert data[0][3] == 'foo'
+
+
+def test_sqlite_write_tle_txt(sqlite_db, iss_tle, tmp_path):
+    """Test reading data from the database and writing it to a file."""
+    import glob
+    tle_dir = str(tmp_path / 'tle_dir')
+    sqlite_db.writer_config["output_dir"] = tle_dir
+    # Use a fake clock so that the two written files get different names
+    now = datetime.datetime(2023, 1, 20, 12, 0, 0)
+    sqlite_db._now = iter([now, now + datetime.timedelta(seconds=1)]).__next__
+
+    # Put some data in the database
+    sqlite_db.update_db(iss_tle, 'foo')
+
+    # Fake that the database hasn't been updated
+    sqlite_db.updated = False
+
+    # Try to dump the data to disk
+    sqlite_db.write_tle_txt()
+
+    # The output dir hasn't been created
+    assert not os.path.exists(tle_dir)
+
+    sqlite_db.updated = True
+    sqlite_db.write_tle_txt()
+
+    # The dir should be there
+    assert os.path.exists(tle_dir)
+    # There should be one file in the directory
+    files = glob.glob(os.path.join(tle_dir, 'tle_*txt'))
+    assert len(files) == 1
+    # The file should have been named with the date ('%' characters
+    # not there anymore)
+    assert '%' not in files[0]
+    # The satellite name should be in the file
+    with open(files[0], 'r') as fid:
+        data = fid.read().split('\n')
+    assert len(data) == 3
+    assert 'ISS' in data[0]
+    assert data[1] == line1
+    assert data[2] == line2
+
+    # Call the writing again, nothing should be written. In
+    # real-life this assumes a re-run has been done without new
+    # TLE data
+    sqlite_db.updated = False
+    sqlite_db.write_tle_txt()
+    files = glob.glob(os.path.join(tle_dir, 'tle_*txt'))
+    assert len(files) == 1
+
+    # Force writing with every call
+    # Do not write the satellite name
+    sqlite_db.writer_config["write_always"] = True
+    sqlite_db.writer_config["write_name"] = False
+    sqlite_db.write_tle_txt()
+    files = sorted(glob.glob(os.path.join(tle_dir, 'tle_*txt')))
+    assert len(files) == 2
+    with open(files[1], 'r') as fid:
+        data = fid.read().split('\n')
+    assert len(data) == 2
+    assert data[0] == line1
+    assert data[1] == line2
@@ -176,7 +176,12 @@ class Tle(object):
     """Class holding TLE objects."""
 
     def __init__(self, platform, tle_file=None, line1=None, line2=None):
-        """Init."""
+        """Init.
+
+        The *tle_file* can be a filename or a file-like object (e.g.
+        :class:`io.StringIO` or :class:`io.BytesIO`) to read the TLE from.
+
+        """
         self._platform = platform.strip().upper()
         self._tle_file = tle_file
         self._line1 = line1
@@ -311,7 +316,8 @@ def _get_uris_and_open_func(tle_file=None):
     local_tle_path = _get_local_tle_path_from_env()
 
     if tle_file:
-        if isinstance(tle_file, io.StringIO):
+        if hasattr(tle_file, "read"):
+            # Any file-like object (e.g. io.StringIO or io.BytesIO)
             uris = (tle_file,)
             open_func = _dummy_open_stringio
         elif "ADMIN_MESSAGE" in tle_file:
@@ -527,6 +533,8 @@ class SQLiteTLE(object):
         self.platforms = platforms
         self.writer_config = writer_config
         self.updated = False
+        # Source of the current time used when writing the TLE files
+        self._now = dt.datetime.utcnow
 
         # Create platform_names table if it doesn't exist
         if not table_exists(self.db, "platform_names"):
@@ -575,7 +583,7 @@ class SQLiteTLE(object):
             return
         pattern = os.path.join(self.writer_config["output_dir"],
                                self.writer_config["filename_pattern"])
-        now = dt.datetime.utcnow()
+        now = self._now()
         fname = now.strftime(pattern)
         out_dir = os.path.dirname(fname)
         if not os.path.exists(out_dir):
@@ -590,8 +598,7 @@ class SQLiteTLE(object):
                      "epoch DESC LIMIT 1" % satid)
             epoch, tle = self.db.execute(query).fetchone()
             date_epoch = dt.datetime.strptime(epoch, ISO_TIME_FORMAT)
-            tle_age = (
-                dt.datetime.utcnow() - date_epoch).total_seconds() / 3600.
+            tle_age = (now - date_epoch).total_seconds() / 3600.
             logging.info("Latest TLE for '%s' (%s) is %d hours old.",
                          satid, platform_name, int(tle_age))
             data.append(tle)